@@ -1,17 +1,33 @@
 # Code created by Siddharth Ahuja: www.github.com/ahujasid © 2025
 
 import io
+import itertools
 import json
+import logging
+import math
 import os
+import platform
 import queue
+import selectors
 import socket
+import subprocess
 import sys
+import tempfile
 import threading
 import time
 import traceback
-from contextlib import redirect_stdout
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from contextlib import redirect_stderr, redirect_stdout
 
 import bpy
+import mathutils
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib json module
+    orjson = None
 
 bl_info = {
     "name": "Blender MCP",
@@ -35,13 +51,232 @@ if src_dir not in sys.path:
 # Updated path after refactoring - Python files moved to share/py/bl/
 DEFAULT_SCRIPTS_ROOT = "\\\\wsl$\\Ubuntu\\home\\doer\\data_files\\video_scripts\\share\\py\\bl"
 
+# Immutable part of the script execution namespace, copied per script run
+_BASE_SCRIPT_NS = {
+    "bpy": bpy,
+    "mathutils": mathutils,
+    "math": math,
+    "os": os,
+    "sys": sys,
+    "time": time,
+    "tempfile": tempfile,
+    "Vector": mathutils.Vector,
+    "print": print,
+    "__builtins__": __builtins__,  # Full builtins access
+}
+
+# Compiled script cache: path -> (mtime_ns, code object, source size), LRU-bounded
+_SCRIPT_CODE_CACHE = OrderedDict()
+_SCRIPT_CODE_CACHE_SIZE = 64
+
+
+def _load_script_code(script_path):
+    """Return (code, size) for a script, recompiling only when its mtime changes"""
+    mtime_ns = os.stat(script_path).st_mtime_ns
+    cached = _SCRIPT_CODE_CACHE.get(script_path)
+    if cached and cached[0] == mtime_ns:
+        _SCRIPT_CODE_CACHE.move_to_end(script_path)
+        return cached[1], cached[2]
+
+    with open(script_path, encoding="utf-8") as f:
+        source = f.read()
+    code = compile(source, script_path, "exec")
+
+    _SCRIPT_CODE_CACHE[script_path] = (mtime_ns, code, len(source))
+    _SCRIPT_CODE_CACHE.move_to_end(script_path)
+    if len(_SCRIPT_CODE_CACHE) > _SCRIPT_CODE_CACHE_SIZE:
+        _SCRIPT_CODE_CACHE.popitem(last=False)
+    return code, len(source)
+
+
+def _json_dumps_stdlib(obj):
+    """Serialize a response to UTF-8 JSON bytes with the stdlib encoder"""
+    return json.dumps(obj, ensure_ascii=False, default=str).encode(
+        "utf-8", errors="replace",
+    )
+
+
+def _json_dumps(obj):
+    """Serialize a response to UTF-8 JSON bytes, preferring orjson when available"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS, default=str)
+        except (orjson.JSONEncodeError, TypeError):
+            # e.g. lone surrogates or oversized ints - let the stdlib handle them
+            pass
+    return _json_dumps_stdlib(obj)
+
+
+def _json_loads(body):
+    """Parse a request body (UTF-8 bytes), preferring orjson when available"""
+    if orjson is not None:
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            # e.g. NaN literals or huge ints - the stdlib parser accepts
+            # those, and produces the error message for genuinely bad input
+            pass
+    return json.loads(body.decode("utf-8"))
+
+
+# Message framing: a 4-byte big-endian length prefix followed by the JSON body.
+# A frame header always starts with a NUL byte (bodies are < 16 MiB), which can
+# never start a JSON document, so legacy unframed clients are detected and
+# answered with raw JSON.
+_FRAME_HEADER_SIZE = 4
+_MAX_FRAME_SIZE = (1 << 24) - 1
+_RECV_CHUNK_SIZE = 65536
+
+# How often the reactor wakes up to notice a stop or an expired command
+_REACTOR_POLL_INTERVAL = 0.5
+
+# Main-thread time the queue processor may spend per timer call before it
+# yields back to Blender's UI (a single long task can still exceed it)
+_QUEUE_TIME_BUDGET = 0.005
+
+# Seconds a client waits for the main thread before getting a timeout error
+_COMMAND_TIMEOUT = 60.0
+
+# Bytes JSON allows around a legacy request
+_JSON_WHITESPACE = b" \t\r\n"
+
+
+def _parse_request(buf):
+    """Split one complete request off the front of a client's input buffer
+
+    Whitespace ahead of a request is dropped from buf. Returns (body, framed,
+    consumed, command), or None while the request is still incomplete.
+    command is the already-parsed legacy request, or None when the caller
+    still has to parse body. A malformed legacy request is returned whole so
+    the caller can report it; one that outgrows _MAX_FRAME_SIZE without
+    completing raises ConnectionAbortedError.
+    """
+    # No frame header starts with whitespace, so this only ever strips the
+    # separators legacy clients put between requests
+    first = 0
+    while first < len(buf) and buf[first] in _JSON_WHITESPACE:
+        first += 1
+    if first:
+        del buf[:first]
+        if not buf:
+            return None
+
+    if buf[0] == 0:
+        if len(buf) < _FRAME_HEADER_SIZE:
+            return None
+        # The leading NUL byte already caps size at _MAX_FRAME_SIZE
+        size = int.from_bytes(buf[:_FRAME_HEADER_SIZE], "big")
+        end = _FRAME_HEADER_SIZE + size
+        if len(buf) < end:
+            return None
+        return bytes(buf[_FRAME_HEADER_SIZE:end]), True, end, None
+
+    # Legacy unframed client: one JSON object, complete once it parses
+    if buf[0] != 0x7B:  # "{"
+        return bytes(buf), False, len(buf), None
+    if len(buf) > _MAX_FRAME_SIZE:
+        raise ConnectionAbortedError("Unframed request exceeds the maximum request size")
+    last = len(buf) - 1
+    while buf[last] in _JSON_WHITESPACE:
+        last -= 1
+    # Only parse once the buffer could hold a whole object, so a large
+    # request is not re-parsed from the start after every recv
+    if buf[last] != 0x7D:  # "}"
+        return None
+    try:
+        command = _json_loads(buf)
+    except UnicodeDecodeError:
+        pass
+    except json.JSONDecodeError as e:
+        if e.pos >= len(e.doc) or e.msg.startswith("Unterminated string"):
+            # That "}" closed a nested object or sat in a string
+            return None
+    else:
+        return bytes(buf), False, len(buf), command
+    return bytes(buf), False, len(buf), None
+
+
+def _frame(payload, framed):
+    """Prefix payload with its length when the client uses framing"""
+    if framed:
+        return len(payload).to_bytes(_FRAME_HEADER_SIZE, "big") + payload
+    return payload
+
+
+# Keepalive probing for accepted clients: idle seconds, interval, probe count
+_KEEPALIVE_OPTIONS = (
+    ("TCP_KEEPIDLE", 30),
+    ("TCP_KEEPINTVL", 10),
+    ("TCP_KEEPCNT", 3),
+)
+
+
+def _tune_client_socket(client):
+    """Disable Nagle and enable keepalive so dead peers are reaped early
+
+    Only TCP_NODELAY is required; keepalive tuning is best-effort because
+    some platforms define the constants but reject the options.
+    """
+    client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    try:
+        client.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    except OSError as e:
+        _log.debug("SO_KEEPALIVE not supported: %s", e)
+        return
+    for name, value in _KEEPALIVE_OPTIONS:
+        option = getattr(socket, name, None)
+        if option is None:
+            continue
+        try:
+            client.setsockopt(socket.IPPROTO_TCP, option, value)
+        except OSError as e:
+            _log.debug("%s not supported: %s", name, e)
+
+
+def _reset_buffer(buf):
+    """Empty a reusable StringIO capture buffer and return it"""
+    buf.seek(0)
+    buf.truncate()
+    return buf
+
+
+# Verbose diagnostics, enabled with the MCP_DEBUG environment variable
+_DEBUG = bool(os.environ.get("MCP_DEBUG"))
+
+# Addon logger: INFO by default so debug messages are never formatted
+_log = logging.getLogger("blendermcp")
+if not _log.handlers:
+    _handler = logging.StreamHandler(sys.stdout)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    _log.addHandler(_handler)
+    _log.propagate = False
+_log.setLevel(logging.DEBUG if _DEBUG else logging.INFO)
+
 # Global variables for server management
 _server_instance = None
 _monitor_timer_running = False
 _last_restart_time = 0
-_restart_count = 0
+# Restart counting without a lock: next() on itertools.count is atomic under
+# the GIL; restarts this hour = _restart_total - _restart_base
+_restart_counter = itertools.count(1)
+_restart_total = 0
+_restart_base = 0
 _max_restarts_per_hour = 10
 
+# Restart requests posted by the server thread, handled on the main thread
+_restart_requests = queue.Queue()
+
+# Restart state machine: "idle" -> "stopping" -> "starting" -> "idle"
+_restart_state = "idle"
+
+# Back-off delays between start attempts when a restart fails to bind; once
+# they are used up the restart keeps retrying at the slow interval
+_restart_retry_delays = (0.5, 1.0, 2.0)
+_restart_slow_retry_delay = 30.0
+_restart_attempt = 0
+# Set while only slow retries are left, so the panel can show the failure
+_restart_failed = False
+
 # Global variables for UI logging control
 _last_ui_log_time = 0
 _ui_log_cooldown = 5.0  # 5秒内不重复打印相同的UI日志
@@ -50,25 +285,110 @@ _ui_log_cooldown = 5.0  # 5秒内不重复打印相同的UI日志
 def _global_queue_processor():
     """Global function wrapper for queue processing to ensure proper timer callback"""
     global _server_instance
-    # Add debug logging to see if timer is being called
-    print("[MCP_GLOBAL_TIMER] 全局定时器被调用")
-    
+
     if _server_instance and _server_instance.running:
         try:
             return _server_instance._process_execution_queue()
         except Exception as e:
-            print(f"[MCP_GLOBAL_PROCESSOR] 全局队列处理器错误: {e}")
+            _log.error("[MCP_GLOBAL_PROCESSOR] 全局队列处理器错误: %s", e)
             return 0.1
     else:
-        print(f"[MCP_GLOBAL_TIMER] 服务器状态: instance={_server_instance is not None}, running={_server_instance.running if _server_instance else False}")
+        _log.debug(
+            "[MCP_GLOBAL_TIMER] 服务器状态: instance=%s, running=%s",
+            _server_instance is not None,
+            _server_instance.running if _server_instance else False,
+        )
     return None
 
 
+# Pre-encoded heartbeat response; only the timestamp varies
+_HEARTBEAT_PREFIX = b'{"status":"success","message":"heartbeat_response","timestamp":'
+_HEARTBEAT_SUFFIX = b"}"
+
+
+def _heartbeat_payload():
+    """Build the heartbeat response bytes without going through json.dumps"""
+    return _HEARTBEAT_PREFIX + repr(time.time()).encode() + _HEARTBEAT_SUFFIX
+
+
+class _DeferredTraceback:
+    """A traceback that is only formatted when the response is serialized
+
+    The frames are summarised on the main thread, so no frame, local or
+    script namespace outlives the command. Formatting to text happens when
+    the JSON encoders call str() on it (default=str) on the reactor thread,
+    and never for clients that have already gone.
+    """
+
+    __slots__ = ("summary",)
+
+    def __init__(self, exc):
+        self.summary = traceback.TracebackException(type(exc), exc, exc.__traceback__)
+
+    def __str__(self):
+        return "".join(self.summary.format())
+
+
+def _safe_tb():
+    """Format the current traceback only when debugging is enabled"""
+    return traceback.format_exc() if _DEBUG else ""
+
+
+def _print_scene_stats():
+    """Debug helper: log object and in-use material counts on one line"""
+    scene_objects = bpy.context.scene.objects
+    materials = bpy.data.materials
+    active_mats = sum(1 for m in materials if m.users)
+    _log.debug("[MCP_SCENE] 对象数量=%d 材质数量=%d", len(scene_objects), active_mats)
+
+
+class _ClientConnection:
+    """Per-client buffers for the selector-based reactor in _server_loop"""
+
+    __slots__ = ("sock", "inbuf", "outbuf", "framed", "pending", "deadline")
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.inbuf = bytearray()
+        self.outbuf = bytearray()
+        self.framed = False
+        # Future of the command waiting on the main thread; one at a time
+        self.pending = None
+        self.deadline = 0.0
+
+
 # BlenderMCPProperties 类已被移除以解决 _PropertyDeferred 错误
 # 直接使用 DEFAULT_SCRIPTS_ROOT 常量和简单的全局配置
 
 
 class BlenderMCPServer:
+    __slots__ = (
+        "host",
+        "port",
+        "running",
+        "socket",
+        "server_thread",
+        "_clients",
+        "_completed",
+        "_wake_r",
+        "_wake_w",
+        "total_client_connections",
+        "active_client_connections",
+        "total_commands_processed",
+        "last_client_time",
+        "start_time",
+        "last_error",
+        "last_error_short",
+        "_last_health_check",
+        "_health_check_result",
+        "_health_check_interval",
+        "_execution_queue",
+        "_queue_lock",
+        "_queue_processor_registered",
+        "_stdout_buf",
+        "_stderr_buf",
+    )
+
     def __init__(self, host="0.0.0.0", port=9876):
         self.host = host
         self.port = port
@@ -76,6 +396,13 @@ class BlenderMCPServer:
         self.socket = None
         self.server_thread = None
 
+        # Reactor state: open clients (server thread only), connections whose
+        # command finished, and a socket pair used to wake the reactor for them
+        self._clients = set()
+        self._completed = deque()
+        self._wake_r = None
+        self._wake_w = None
+
         # Connection statistics
         self.total_client_connections = 0
         self.active_client_connections = 0
@@ -83,16 +410,30 @@ class BlenderMCPServer:
         self.last_client_time = None
         self.start_time = None
         self.last_error = None
+        self.last_error_short = None
 
         # Health check cache - optimized for UI responsiveness
-        self._last_health_check = 0
-        self._health_check_result = False
+        # Cached snapshot is (healthy, thread_alive, running); the TTL below is
+        # the only knob, so is_alive() is not re-queried inside the window
+        self._last_health_check = float("-inf")
+        self._health_check_result = (False, False, False)
         self._health_check_interval = 10.0  # 10 seconds for UI responsiveness
 
         # Execution queue for main thread operations
-        self._execution_queue = queue.Queue()
+        # Many producers (client threads), one consumer (Blender main thread)
+        self._execution_queue = deque()
+        self._queue_lock = threading.Lock()
         self._queue_processor_registered = False
 
+        # Capture buffers reused across executions (main thread only)
+        self._stdout_buf = io.StringIO()
+        self._stderr_buf = io.StringIO()
+
+    def _set_error(self, msg):
+        """Record an error, precomputing the truncated form shown in the panel"""
+        self.last_error = msg
+        self.last_error_short = msg[:50] + "..." if len(msg) > 50 else msg
+
     def get_scripts_root(self):
         """Get the configured scripts root directory"""
         # 直接返回默认路径，避免属性访问问题
@@ -100,12 +441,13 @@ class BlenderMCPServer:
 
     def start(self):
         if self.running:
-            print("Server is already running")
+            _log.info("Server is already running")
             return True
 
         self.running = True
         self.start_time = time.time()
         self.last_error = None
+        self.last_error_short = None
 
         try:
             # Create socket
@@ -115,43 +457,48 @@ class BlenderMCPServer:
             # Try to bind to the port
             try:
                 self.socket.bind((self.host, self.port))
-                self.socket.listen(1)
+                self.socket.listen(64)
+                # Polled by a selector in _server_loop; never block in accept()
+                self.socket.setblocking(False)
             except OSError as e:
-                print(f"Failed to bind to port {self.port}: {e}")
-                self.last_error = f"Port binding failed: {e}"
+                _log.error("Failed to bind to port %d: %s", self.port, e)
+                self._set_error(f"Port binding failed: {e}")
                 self.socket.close()
                 self.socket = None
                 self.running = False
                 return False
 
+            # Lets the main thread wake the reactor when a command completes
+            self._wake_r, self._wake_w = socket.socketpair()
+            self._wake_r.setblocking(False)
+            self._wake_w.setblocking(False)
+
             # Start server thread
             self.server_thread = threading.Thread(target=self._server_loop)
             self.server_thread.daemon = True
             self.server_thread.start()
 
-            # 确保队列处理器立即注册
-            self._ensure_queue_processor()
-
-            print(f"BlenderMCP server started on {self.host}:{self.port}")
-            print(f"队列处理器已注册: {self._queue_processor_registered}")
-            print(f"当前 Blender PID: {os.getpid()}")
+            _log.info("BlenderMCP server started on %s:%d", self.host, self.port)
+            _log.info("当前 Blender PID: %d", os.getpid())
 
             # 调试信息
-            print("===== MCP服务器状态 =====")
-            print(f"服务器运行状态: {self.running}")
-            print(f"服务器IP: {self.host}")
-            print(f"服务器端口: {self.port}")
-            print(
-                f"服务器启动时间: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.start_time)) if self.start_time else '未启动'}",
-            )
-            print(f"最后错误: {self.last_error or '无'}")
-            print("=========================")
+            if _DEBUG:
+                _log.debug("===== MCP服务器状态 =====")
+                _log.debug("服务器运行状态: %s", self.running)
+                _log.debug("服务器IP: %s", self.host)
+                _log.debug("服务器端口: %d", self.port)
+                _log.debug(
+                    "服务器启动时间: %s",
+                    time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.start_time)),
+                )
+                _log.debug("最后错误: %s", self.last_error or "无")
+                _log.debug("=========================")
 
             return True
 
         except Exception as e:
-            print(f"Failed to start server: {e!s}")
-            self.last_error = f"Startup failed: {e}"
+            _log.error("Failed to start server: %s", e)
+            self._set_error(f"Startup failed: {e}")
             self.stop()
             return False
 
@@ -161,94 +508,85 @@ class BlenderMCPServer:
 
         self.running = False
 
-        # Close socket first to break accept() loop
-        if self.socket:
+        # The reactor sees running=False within one poll interval and closes
+        # its clients on the way out
+        if self.server_thread and self.server_thread.is_alive():
             try:
-                self.socket.close()
+                self.server_thread.join(timeout=2.0)
             except:
                 pass
-            self.socket = None
+            self.server_thread = None
 
-        # Wait for thread to finish
-        if self.server_thread and self.server_thread.is_alive():
+        if self.socket:
             try:
-                self.server_thread.join(timeout=2.0)
+                self.socket.close()
             except:
                 pass
-            self.server_thread = None
+            self.socket = None
+
+        for wake_sock in (self._wake_r, self._wake_w):
+            if wake_sock:
+                wake_sock.close()
 
         # Unregister queue processor
         if self._queue_processor_registered:
             try:
-                if bpy.app.timers.is_registered(self._process_execution_queue):
-                    bpy.app.timers.unregister(self._process_execution_queue)
+                if bpy.app.timers.is_registered(_global_queue_processor):
+                    bpy.app.timers.unregister(_global_queue_processor)
                 self._queue_processor_registered = False
             except:
                 pass
 
-        print("BlenderMCP server stopped")
+        _log.info("BlenderMCP server stopped")
 
     def is_healthy(self, force_refresh=False):
         """Check if server is healthy based on running state and recent activity"""
         if not self.running or not self.socket:
             return False
 
-        current_time = time.time()
+        # Use cached snapshot to reduce test frequency (unless forced refresh);
+        # the TTL runs on the monotonic clock so wall-clock jumps cannot stall it
+        now = time.monotonic()
+        if not force_refresh and now - self._last_health_check < self._health_check_interval:
+            return self._health_check_result[0]
 
-        # Use cached result to reduce test frequency (unless forced refresh)
-        if not force_refresh and current_time - self._last_health_check < self._health_check_interval:
-            return self._health_check_result
+        current_time = time.time()
 
         # Simplified health check based on server state instead of network testing
         # This avoids WSL network issues while providing meaningful health status
+        healthy = False
+        thread_alive = False
         try:
-            # Check basic server state
-            if not self.running or not self.socket:
-                self._health_check_result = False
-                self._last_health_check = current_time
-                return False
-
-            # Check if server thread is alive
-            if not self.server_thread or not self.server_thread.is_alive():
-                print("[MCP_HEALTH] 服务器线程未运行")
-                self._health_check_result = False
-                self._last_health_check = current_time
-                return False
-
-            # Check recent activity - if we've processed commands recently, server is healthy
-            recent_activity_threshold = 300  # 5 minutes
-            if (self.last_client_time and 
-                current_time - self.last_client_time < recent_activity_threshold):
-                print(f"[MCP_HEALTH] 基于最近活动的健康检查通过 (最后客户端: {current_time - self.last_client_time:.1f}秒前)")
-                self._health_check_result = True
-                self._last_health_check = current_time
-                return True
-
-            # If no recent activity but server is running, still consider it healthy
-            # This handles the case where server just started or has been idle
-            if self.total_commands_processed > 0:
-                print(f"[MCP_HEALTH] 基于命令处理历史的健康检查通过 (已处理{self.total_commands_processed}个命令)")
-                self._health_check_result = True
-                self._last_health_check = current_time
-                return True
-
-            # For new servers with no activity yet, check if they can bind to port
-            if self.total_commands_processed == 0:
-                print("[MCP_HEALTH] 新服务器，基于运行状态检查通过")
-                self._health_check_result = True
-                self._last_health_check = current_time
-                return True
-
-            # Default to healthy if server is running without obvious issues
-            self._health_check_result = True
-            self._last_health_check = current_time
-            return True
+            thread_alive = bool(self.server_thread and self.server_thread.is_alive())
+
+            if not thread_alive:
+                _log.debug("[MCP_HEALTH] 服务器线程未运行")
+            elif (self.last_client_time and
+                  current_time - self.last_client_time < 300):  # 5 minutes
+                # Recent client activity means the server is healthy
+                _log.debug(
+                    "[MCP_HEALTH] 基于最近活动的健康检查通过 (最后客户端: %.1f秒前)",
+                    current_time - self.last_client_time,
+                )
+                healthy = True
+            elif self.total_commands_processed > 0:
+                _log.debug(
+                    "[MCP_HEALTH] 基于命令处理历史的健康检查通过 (已处理%d个命令)",
+                    self.total_commands_processed,
+                )
+                healthy = True
+            else:
+                # New or idle server that is still running
+                _log.debug("[MCP_HEALTH] 新服务器，基于运行状态检查通过")
+                healthy = True
 
         except Exception as e:
-            print(f"[MCP_HEALTH] 健康检查异常: {e}")
-            self._health_check_result = False
-            self._last_health_check = current_time
-            return False
+            _log.error("[MCP_HEALTH] 健康检查异常: %s", e)
+            healthy = False
+
+        self._health_check_result = (healthy, thread_alive, self.running)
+        self._last_health_check = now
+        return healthy
 
     def get_server_status(self) -> dict:
         """Get comprehensive server status information"""
@@ -260,8 +598,9 @@ class BlenderMCPServer:
                 "host": self.host,
                 "port": self.port,
                 "uptime": uptime,
-                "healthy": self.is_healthy(force_refresh=True),
+                "healthy": self.is_healthy(),
                 "last_error": self.last_error,
+                "last_error_short": self.last_error_short,
             },
             "connections": {
                 "total": self.total_client_connections,
@@ -278,358 +617,381 @@ class BlenderMCPServer:
     def _process_execution_queue(self):
         """Process pending execution tasks from the queue"""
         try:
-            # 初始化计数器属性（如果不存在）
-            if not hasattr(self, "_debug_print_counter"):
-                self._debug_print_counter = 0
-
-            # 每100次循环或队列不为空时打印状态（用于调试）
-            queue_size = self._execution_queue.qsize() if hasattr(self._execution_queue, 'qsize') else 0
-            if (
-                queue_size > 0
-                or self._debug_print_counter % 100 == 0
-            ):
-                print(
-                    f"[MCP_QUEUE_PROCESSOR] 当前队列任务数: {queue_size}",
-                )
-
-            # 递增计数器
-            self._debug_print_counter += 1
-
-            # Process up to 5 tasks per timer call to avoid blocking too long
-            for _ in range(5):
-                if self._execution_queue.empty():
-                    break
-
-                task = self._execution_queue.get_nowait()
+            pending = self._execution_queue
+
+            # 确保当前上下文可用（每次定时器回调只检查一次）
+            if bpy.context is None:
+                _log.error("[MCP_ERROR] bpy.context 不可用")
+                while pending:
+                    future = pending.popleft()["future"]
+                    if future.set_running_or_notify_cancel():
+                        future.set_result({
+                            "status": "error",
+                            "message": "Blender context is not available",
+                        })
+                return self._reschedule_queue_processor()
+
+            if _DEBUG:
+                scene = bpy.context.scene
+                _log.debug("[MCP_BLENDER] 版本=%s, PID=%d", bpy.app.version_string, os.getpid())
+                _log.debug("[MCP_SCENE] 场景名=%s, 对象数=%d", scene.name, len(scene.objects))
+
+            # Drain until the queue is empty or the time budget is spent, then
+            # yield to the UI; at least one task runs per call
+            scene_dirty = False
+            deadline = time.perf_counter() + _QUEUE_TIME_BUDGET
+            while pending:
+                task = pending.popleft()
+                future = task["future"]
+                if not future.set_running_or_notify_cancel():
+                    # Cancelled by a client that disconnected or timed out
+                    continue
+
+                command = task["command"]
+                command_type = command.get("type", "unknown")
+
+                # 上一个脚本修改过场景时，先刷新再执行后续命令
+                if scene_dirty:
+                    self._simple_ui_refresh()
+                    scene_dirty = False
+
+                # 执行任务
                 try:
-                    print(
-                        f"[MCP_EXECUTOR] 执行队列任务: {task.get('type', 'unknown')} - 开始处理",
-                    )
-                    print(
-                        f"[MCP_EXECUTOR] 执行详情: 任务类型={task.get('type', 'unknown')}, 时间={time.strftime('%Y-%m-%d %H:%M:%S')}",
-                    )
-
-                    # 确保当前上下文可用
-                    if task.get("type") != "heartbeat":
-                        print("[MCP_EXECUTOR] 非心跳任务, 检查上下文...")
-                        if bpy.context is None:
-                            print("[MCP_ERROR] bpy.context 不可用")
-                            task["result_container"]["result"] = {
-                                "status": "error",
-                                "message": "Blender context is not available",
-                            }
-                            task["result_container"]["completed"] = True
-                            continue
-
-                        # 额外打印 Blender 信息
-                        print(
-                            f"[MCP_BLENDER] 版本={bpy.app.version_string}, PID={os.getpid()}",
-                        )
-                        print(
-                            f"[MCP_SCENE] 场景名={bpy.context.scene.name}, 对象数={len(bpy.context.scene.objects)}",
-                        )
-
-                    # 执行任务
-                    result = task["function"]()
-                    task["result_container"]["result"] = result
-                    task["result_container"]["completed"] = True
-                    print(f"[MCP_EXECUTOR] {task.get('type', 'unknown')} - 执行成功")
-
-                    # 如果是脚本或代码执行，进行简单的场景更新
-                    if task.get("type") in ["execute_code", "execute_script_file"]:
-                        try:
-                            # 简单UI刷新
-                            self._simple_ui_refresh()
-                        except Exception as view_err:
-                            print(f"[MCP_UI_REFRESH] UI刷新失败 - {view_err}")
-
+                    result = self.execute_command(command)
+                    _log.debug("[MCP_EXECUTOR] %s - 执行成功", command_type)
                 except Exception as e:
-                    task["result_container"]["result"] = {
+                    result = {
                         "status": "error",
                         "message": str(e),
-                        "traceback": traceback.format_exc(),
+                        "traceback": _safe_tb(),
                     }
-                    task["result_container"]["completed"] = True
-                    print(f"[MCP_EXECUTOR] {task.get('type', 'unknown')} - 执行失败")
-                    print(f"[MCP_ERROR] 错误详情: {e}")
-                    print(f"[MCP_ERROR] 错误堆栈: {traceback.format_exc()}")
+                    _log.error("[MCP_EXECUTOR] %s - 执行失败: %s", command_type, e)
+                future.set_result(result)
+
+                # 脚本或代码执行可能修改了场景，标记为待刷新
+                if command_type in ("execute_code", "execute_script_file"):
+                    scene_dirty = True
+
+                if time.perf_counter() >= deadline:
+                    break
+
+            # 每批命令结束后最多做一次简单的场景更新
+            if scene_dirty:
+                self._simple_ui_refresh()
 
-        except queue.Empty:
-            pass
         except Exception as e:
-            print(f"[MCP_QUEUE_PROCESSOR] 队列处理器错误: {e}")
-            print(f"[MCP_ERROR] 堆栈: {traceback.format_exc()}")
+            _log.error("[MCP_QUEUE_PROCESSOR] 队列处理器错误: %s", e)
+            _log.debug("[MCP_ERROR] 堆栈", exc_info=True)
 
-        # Continue processing - return small interval to check queue frequently
-        return 0.1 if self.running else None
+        return self._reschedule_queue_processor()
 
-    def _ensure_queue_processor(self):
-        """Ensure the queue processor is registered"""
-        global _global_queue_processor
-        if not self._queue_processor_registered and self.running:
-            try:
-                # Try to unregister first in case it's already registered
-                if bpy.app.timers.is_registered(_global_queue_processor):
-                    bpy.app.timers.unregister(_global_queue_processor)
-                
-                # Register the global timer function
-                bpy.app.timers.register(_global_queue_processor, first_interval=0.1)
-                self._queue_processor_registered = True
-                print("[MCP_TIMER] 队列处理器已注册: True")
-            except Exception as e:
-                print(f"[MCP_ERROR] 队列处理器注册失败: {e}")
+    def _reschedule_queue_processor(self):
+        """Timer return value: keep going while work is pending, else unregister"""
+        if not self.running:
+            return None
+        with self._queue_lock:
+            if not self._execution_queue:
                 self._queue_processor_registered = False
+                return None
+        return 0.01
 
-    def _server_loop(self):
-        """Main server loop to handle client connections"""
-        while self.running:
+    def _submit_task(self, task):
+        """Queue a task for the main thread, waking the queue processor on demand"""
+        with self._queue_lock:
+            self._execution_queue.append(task)
+            needs_timer = not self._queue_processor_registered
+            self._queue_processor_registered = True
+
+        if needs_timer:
             try:
-                if not self.socket:
-                    break
+                bpy.app.timers.register(_global_queue_processor, first_interval=0.0)
+                _log.debug("[MCP_TIMER] 队列处理器已注册: True")
+            except Exception as e:
+                _log.error("[MCP_ERROR] 队列处理器注册失败: %s", e)
+                with self._queue_lock:
+                    self._queue_processor_registered = False
 
-                client, address = self.socket.accept()
-                self.total_client_connections += 1
-                self.active_client_connections += 1
-                self.last_client_time = time.time()
+    def _server_loop(self):
+        """Reactor thread: accepts clients and does all client socket I/O
 
-                # Handle client in separate thread
-                client_thread = threading.Thread(
-                    target=self._handle_client,
-                    args=(client,),
-                )
-                client_thread.daemon = True
-                client_thread.start()
+        Commands still run on the main thread through the execution queue;
+        finished commands come back via _completed and the wake-up socket.
+        """
+        listener = self.socket
+        with selectors.DefaultSelector() as selector:
+            selector.register(listener, selectors.EVENT_READ)
+            selector.register(self._wake_r, selectors.EVENT_READ)
+            try:
+                while self.running:
+                    events = selector.select(timeout=_REACTOR_POLL_INTERVAL)
+                    for key, mask in events:
+                        if key.fileobj is listener:
+                            self._accept_client(selector)
+                        elif key.fileobj is self._wake_r:
+                            self._drain_completed(selector)
+                        else:
+                            self._service_client(selector, key.data, mask)
+                    self._expire_pending(selector)
 
-            except OSError:
-                # Socket was closed, exit loop
-                break
+            except OSError as e:
+                # The listening socket failed under us
+                if self.running:
+                    self._set_error(f"Accept failed: {e}")
             except Exception as e:
                 if self.running:
-                    print(f"Server loop error: {e}")
-                    self.last_error = str(e)
+                    _log.error("Server loop error: %s", e)
+                    self._set_error(f"Server loop error: {e}")
+            finally:
+                for conn in list(self._clients):
+                    self._close_client(selector, conn)
+                # Nothing polls the server any more, so a reactor that exits
+                # without being stopped must ask the main thread for a restart
+                if self.running:
+                    _request_restart(self.last_error or "Server loop exited unexpectedly")
 
-    def _handle_client(self, client):
-        """Handle individual client connection"""
+    def _accept_client(self, selector):
+        """Accept one pending connection and register it with the reactor"""
+        try:
+            client, address = self.socket.accept()
+        except (BlockingIOError, ConnectionError):
+            # The pending connection went away between select and accept
+            return
         try:
-            # Set socket timeout to prevent hanging
-            client.settimeout(120.0)  # Increased timeout for script execution
+            client.setblocking(False)
+            _tune_client_socket(client)
+        except OSError as e:
+            # Drop just this connection; the listener is still healthy
+            _log.info("Client setup failed: %s", e)
+            client.close()
+            return
+
+        conn = _ClientConnection(client)
+        self._clients.add(conn)
+        selector.register(client, selectors.EVENT_READ, conn)
+
+        self.total_client_connections += 1
+        self.active_client_connections += 1
+        self.last_client_time = time.time()
 
-            while self.running:
+    def _service_client(self, selector, conn, mask):
+        """Handle a readiness event for one client"""
+        try:
+            if mask & selectors.EVENT_READ:
                 try:
-                    # Receive data from client
-                    data = client.recv(4096)
+                    data = conn.sock.recv(_RECV_CHUNK_SIZE)
+                except BlockingIOError:
+                    data = None
+                if data is not None:
                     if not data:
-                        break
-                except (
-                    ConnectionResetError,
-                    ConnectionAbortedError,
-                    TimeoutError,
-                    OSError,
-                ) as e:
-                    # Handle different types of connection issues
-                    if isinstance(e, TimeoutError):
-                        # Timeout occurred, check if server is still running
-                        if self.running:
-                            continue  # Continue listening for data
-                        break
-                    # Client disconnected unexpectedly
-                    if self.running:
-                        print(f"Client disconnected: {type(e).__name__}: {e}")
-                    break
+                        # Client disconnected; any pending command is cancelled
+                        self._close_client(selector, conn)
+                        return
+                    conn.inbuf += data
+                    self._next_request(selector, conn)
+
+            if mask & selectors.EVENT_WRITE and conn in self._clients:
+                self._flush_client(selector, conn)
+
+        except (ConnectionError, OSError) as e:
+            if self.running:
+                _log.info("Client disconnected: %s: %s", type(e).__name__, e)
+            self._close_client(selector, conn)
+        except Exception as e:
+            _log.error("Client handler error: %s", e)
+            self._close_client(selector, conn)
+
+    def _next_request(self, selector, conn):
+        """Dispatch buffered requests until one has to wait for the main thread"""
+        while conn.pending is None and conn.inbuf:
+            request = _parse_request(conn.inbuf)
+            if request is None:
+                break
+            body, conn.framed, consumed, command = request
+            del conn.inbuf[:consumed]
+            self._dispatch(selector, conn, body, command)
 
-                try:
-                    # Parse JSON command
-                    command = json.loads(data.decode("utf-8"))
-
-                    # Skip logging for health checks to reduce noise
-                    if not command.get("_health_check", False):
-                        print(f"Received command: {command.get('type', 'unknown')}")
-
-                    # Execute command directly - simplified approach without timer-based queue
-                    print(f"[MCP_DIRECT] 直接执行命令: {command.get('type', 'unknown')}")
-                    
-                    if command.get("type") == "execute_script_file":
-                        params = command.get("params", {})
-                        print(f"[MCP_SCRIPT] 脚本执行: 脚本名={params.get('script_name', 'unknown')}")
-                    elif command.get("type") == "execute_code":
-                        print(f"[MCP_CODE] 代码执行: 代码长度={len(command.get('params', {}).get('code', ''))}")
-
-                    # Execute command directly on main thread using a simple mechanism
-                    result_container = {"result": None, "completed": False}
-                    
-                    def execute_on_main():
-                        try:
-                            result = self.execute_command(command)
-                            result_container["result"] = result
-                            result_container["completed"] = True
-                            print(f"[MCP_DIRECT] {command.get('type', 'unknown')} - 执行成功")
-                        except Exception as e:
-                            result_container["result"] = {
-                                "status": "error", 
-                                "message": str(e),
-                                "traceback": traceback.format_exc()
-                            }
-                            result_container["completed"] = True
-                            print(f"[MCP_DIRECT] {command.get('type', 'unknown')} - 执行失败: {e}")
-                    
-                    # Schedule execution on main thread
-                    bpy.app.timers.register(lambda: (execute_on_main(), None)[1], first_interval=0.01)
-                    
-                    # Wait for completion with timeout
-                    timeout = 60.0
-                    start_time = time.time()
-                    while not result_container["completed"]:
-                        time.sleep(0.05)
-                        if time.time() - start_time > timeout:
-                            result_container["result"] = {
-                                "status": "error",
-                                "message": "Command execution timeout",
-                            }
-                            break
-
-                    # Send response back to client
-                    try:
-                        result = result_container["result"]
-                        # 使用ensure_ascii=False确保正确处理Unicode字符，并添加处理错误的选项
-                        response_json = json.dumps(
-                            result,
-                            ensure_ascii=False,
-                            default=str,
-                        )
-                        client.sendall(response_json.encode("utf-8", errors="replace"))
-                        self.total_commands_processed += 1
-                    except (
-                        ConnectionResetError,
-                        ConnectionAbortedError,
-                        BrokenPipeError,
-                        OSError,
-                    ) as e:
-                        # Client disconnected during response - this is normal
-                        if self.running:
-                            print(
-                                f"Client disconnected during response: {type(e).__name__}",
-                            )
-                        break
-                    except Exception as e:
-                        error_response = {
-                            "status": "error",
-                            "message": f"Response sending error: {e!s}",
-                            "traceback": traceback.format_exc(),
-                        }
-                        try:
-                            client.sendall(json.dumps(error_response).encode("utf-8"))
-                        except (
-                            ConnectionResetError,
-                            ConnectionAbortedError,
-                            BrokenPipeError,
-                            OSError,
-                        ):
-                            # Client disconnected during error response
-                            break
-                        except:
-                            pass
-
-                except json.JSONDecodeError as e:
-                    error_response = {
-                        "status": "error",
-                        "message": f"Invalid JSON: {e}",
-                    }
-                    try:
-                        client.sendall(json.dumps(error_response).encode("utf-8"))
-                    except (
-                        ConnectionResetError,
-                        ConnectionAbortedError,
-                        BrokenPipeError,
-                        OSError,
-                    ):
-                        # Client disconnected during error response
-                        break
+        if len(conn.inbuf) > _FRAME_HEADER_SIZE + _MAX_FRAME_SIZE:
+            raise ConnectionAbortedError("Client sent too much data while a command was pending")
 
-        except Exception as e:
-            print(f"Client handler error: {e}")
-        finally:
+    def _dispatch(self, selector, conn, body, command=None):
+        """Answer a heartbeat directly or queue the command for the main thread"""
+        if command is None:
             try:
-                client.close()
-            except:
+                # Parse JSON command
+                command = _json_loads(body)
+            except ValueError as e:
+                self._respond(selector, conn, _json_dumps({
+                    "status": "error",
+                    "message": f"Invalid JSON: {e}",
+                }))
+                return
+        if not isinstance(command, dict):
+            self._respond(selector, conn, _json_dumps({
+                "status": "error",
+                "message": "Invalid JSON: request must be a JSON object",
+            }))
+            return
+
+        # Skip logging for health checks to reduce noise
+        if not command.get("_health_check", False):
+            _log.debug("Received command: %s", command.get("type", "unknown"))
+
+        # Commands are executed on the main thread via the execution queue
+        if _DEBUG:
+            if command.get("type") == "execute_script_file":
+                params = command.get("params", {})
+                _log.debug("[MCP_SCRIPT] 脚本执行: 脚本名=%s", params.get("script_name", "unknown"))
+            elif command.get("type") == "execute_code":
+                _log.debug("[MCP_CODE] 代码执行: 代码长度=%d", len(command.get("params", {}).get("code", "")))
+
+        if command.get("type") == "heartbeat":
+            # Heartbeats never touch Blender state - answer from this thread
+            self._respond(selector, conn, _heartbeat_payload())
+            return
+
+        # Hand the command to the main-thread queue processor
+        future = Future()
+        conn.pending = future
+        conn.deadline = time.monotonic() + _COMMAND_TIMEOUT
+        future.add_done_callback(lambda _f, conn=conn: self._command_done(conn))
+        self._submit_task({"command": command, "future": future})
+
+    def _command_done(self, conn):
+        """Future callback (usually on the main thread): wake the reactor"""
+        self._completed.append(conn)
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            # Wake-up buffer already full, or the server is shutting down
+            pass
+
+    def _drain_completed(self, selector):
+        """Send the results of commands the main thread has finished"""
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+        while self._completed:
+            conn = self._completed.popleft()
+            future = conn.pending
+            if future is None or not future.done() or future.cancelled():
+                # Stale wake-up: timed out, cancelled or client already closed
+                continue
+            conn.pending = None
+            try:
+                self._respond(selector, conn, _json_dumps(future.result()))
+                # Serve any request the client pipelined behind this one
+                self._next_request(selector, conn)
+            except (ConnectionError, OSError) as e:
+                if self.running:
+                    _log.info("Client disconnected during response: %s", type(e).__name__)
+                self._close_client(selector, conn)
+            except Exception as e:
+                _log.error("Client handler error: %s", e)
+                self._close_client(selector, conn)
+
+    def _expire_pending(self, selector):
+        """Answer commands that have waited too long for the main thread"""
+        now = time.monotonic()
+        for conn in [c for c in self._clients if c.pending and now >= c.deadline]:
+            conn.pending.cancel()
+            conn.pending = None
+            try:
+                self._respond(selector, conn, _json_dumps({
+                    "status": "error",
+                    "message": "Command execution timeout",
+                }))
+                self._next_request(selector, conn)
+            except (ConnectionError, OSError):
+                self._close_client(selector, conn)
+            except Exception as e:
+                _log.error("Client handler error: %s", e)
+                self._close_client(selector, conn)
+
+    def _respond(self, selector, conn, payload):
+        """Queue a response for the client and send as much as possible now"""
+        conn.outbuf += _frame(payload, conn.framed)
+        self.total_commands_processed += 1
+        self._flush_client(selector, conn)
+
+    def _flush_client(self, selector, conn):
+        """Write buffered output, watching for writability only while some remains"""
+        if conn.outbuf:
+            try:
+                sent = conn.sock.send(conn.outbuf)
+                del conn.outbuf[:sent]
+            except BlockingIOError:
                 pass
-            self.active_client_connections -= 1
+
+        events = selectors.EVENT_READ
+        if conn.outbuf:
+            events |= selectors.EVENT_WRITE
+        if selector.get_key(conn.sock).events != events:
+            selector.modify(conn.sock, events, conn)
+
+    def _close_client(self, selector, conn):
+        """Unregister and close a client, cancelling its pending command"""
+        if conn not in self._clients:
+            return
+        self._clients.discard(conn)
+        if conn.pending is not None:
+            conn.pending.cancel()
+            conn.pending = None
+        try:
+            selector.unregister(conn.sock)
+        except (KeyError, ValueError):
+            pass
+        try:
+            conn.sock.close()
+        except OSError:
+            pass
+        self.active_client_connections -= 1
 
     def execute_command(self, command):
         """Execute a command and return result"""
         try:
             return self._execute_command_internal(command)
         except Exception as e:
+            # Client-facing error: always include the full traceback, but
+            # leave the formatting to the reactor when the response is sent
             return {
                 "status": "error",
                 "message": str(e),
-                "traceback": traceback.format_exc(),
+                "traceback": _DeferredTraceback(e),
             }
 
     def _execute_command_internal(self, command):
         """Internal command execution logic"""
-        command_type = command.get("type")
-        params = command.get("params", {})
-
-        # 添加 heartbeat 命令支持
-        if command_type == "heartbeat":
+        handler = self._HANDLERS.get(command.get("type"))
+        if handler is None:
             return {
-                "status": "success",
-                "message": "heartbeat_response",
-                "timestamp": time.time(),
-            }
-
-        if command_type == "get_scene_info":
-            return {
-                "status": "success",
-                "data": self.get_scene_info(),
-            }
-
-        if command_type == "execute_code":
-            code = params.get("code", "")
-            result = self.execute_code(code)
-            return {
-                "status": "success",
-                "data": result,
-            }
-
-        if command_type == "get_server_status":
-            return {
-                "status": "success",
-                "data": self.get_server_status(),
-            }
-
-        if command_type == "execute_script_file":
-            script_name = params.get("script_name", "")
-            scripts_directory = params.get("scripts_directory", "scripts")
-            script_parameters = params.get("parameters", {})
-            result = self.execute_script_file(
-                script_name,
-                scripts_directory,
-                script_parameters,
-            )
-            return {
-                "status": "success",
-                "data": result,
+                "status": "error",
+                "message": f"Unknown command type: {command.get('type')}",
             }
-
-        return {
-            "status": "error",
-            "message": f"Unknown command type: {command_type}",
-        }
+        return handler(self, command.get("params", {}))
 
     def get_scene_info(self):
         """Get basic information about the current scene"""
         scene = bpy.context.scene
+        scene_objects = scene.objects
+        n = len(scene_objects)
+
+        # Read all locations in a single RNA call instead of per-object access
+        locs = np.empty(n * 3, dtype=np.float32)
+        scene_objects.foreach_get("location", locs)
+        locs = locs.reshape(n, 3).tolist()
 
-        objects = []
-        for obj in scene.objects:
-            obj_info = {
+        objects = [
+            {
                 "name": obj.name,
                 "type": obj.type,
-                "location": [obj.location[0], obj.location[1], obj.location[2]],
+                "location": loc,
                 "visible": obj.visible_get(),
             }
-            objects.append(obj_info)
+            for obj, loc in zip(scene_objects, locs)
+        ]
 
         return {
             "scene_name": scene.name,
@@ -648,7 +1010,7 @@ class BlenderMCPServer:
             # 只保留基本的视图层更新，这对于MCP操作已经足够
             bpy.context.view_layer.update()
         except Exception as e:
-            print(f"[MCP_UI_REFRESH] 基本更新失败: {e}")
+            _log.error("[MCP_UI_REFRESH] 基本更新失败: %s", e)
 
     def execute_code(self, code):
         """Execute arbitrary Blender Python code"""
@@ -657,14 +1019,13 @@ class BlenderMCPServer:
             namespace = {"bpy": bpy}
 
             # Capture stdout during execution
-            capture_buffer = io.StringIO()
+            capture_buffer = _reset_buffer(self._stdout_buf)
             with redirect_stdout(capture_buffer):
                 exec(code, namespace)
 
             captured_output = capture_buffer.getvalue()
-
-            # 简单的UI刷新
-            self._simple_ui_refresh()
+            # Release the buffer's storage now rather than at the next run
+            _reset_buffer(capture_buffer)
 
             return {"executed": True, "result": captured_output}
         except Exception as e:
@@ -678,11 +1039,7 @@ class BlenderMCPServer:
     ):
         """Execute a Python script file from the scripts directory, supporting relative paths"""
         try:
-            import os
-            import sys
-            from io import StringIO
-
-            print(f"Starting script execution: {script_name}")
+            _log.debug("Starting script execution: %s", script_name)
 
             # Handle relative paths within the scripts directory
             # script_name can now include subdirectories like "basic/create_cube.py"
@@ -701,7 +1058,7 @@ class BlenderMCPServer:
             script_relative_path = script_relative_path.replace("/", "\\")
             script_path = os.path.join(scripts_root, script_relative_path)
 
-            print(f"Looking for script at: {script_path}")
+            _log.debug("Looking for script at: %s", script_path)
 
             # Check if script exists
             if not os.path.exists(script_path):
@@ -709,108 +1066,82 @@ class BlenderMCPServer:
                     f"Script '{script_name}' not found at '{script_path}'. Please check the script name and scripts root directory configuration.",
                 )
 
-            # Read script content
-            with open(script_path, encoding="utf-8") as f:
-                script_content = f.read()
+            # Load compiled script (cached by path and mtime)
+            script_code, script_size = _load_script_code(script_path)
 
-            print(f"Script content loaded, size: {len(script_content)} bytes")
+            _log.debug("Script content loaded, size: %d bytes", script_size)
+
+            # 添加一个帮助函数用于更新场景（仅同步视图层；界面重绘由队列处理器批量完成）
+            def update_scene():
+                self._simple_ui_refresh()
+                _log.debug("[MCP_SCENE_UPDATE] 场景已更新")
 
             # Create comprehensive execution namespace without restrictions
-            namespace = {
-                "bpy": bpy,
-                "mathutils": __import__("mathutils"),
-                "math": __import__("math"),
-                "os": os,
-                "sys": sys,
-                "time": __import__("time"),
-                "tempfile": __import__("tempfile"),
-                "Vector": __import__("mathutils").Vector,
-                "print": print,
+            namespace = _BASE_SCRIPT_NS.copy()
+            namespace.update({
                 "_script_name": script_name,
                 "_script_path": script_path,
                 "_parameters": parameters or {},
-                "__builtins__": __builtins__,  # Full builtins access
-            }
+            })
 
             # Add parameters to namespace
             if parameters:
                 namespace.update(parameters)
 
-            # 添加一个帮助函数用于更新场景
-            def update_scene():
-                try:
-                    self._comprehensive_ui_refresh()
-                    print("[MCP_SCENE_UPDATE] 场景已更新")
-                except Exception as e:
-                    print(f"[MCP_ERROR] 更新场景失败: {e}")
-
             namespace["update_scene"] = update_scene
 
-            print("Executing script...")
+            _log.debug("Executing script...")
 
             # Capture both stdout and stderr during execution
-            original_stdout = sys.stdout
-            original_stderr = sys.stderr
-            capture_buffer = StringIO()
-            error_buffer = StringIO()
-
-            try:
-                sys.stdout = capture_buffer
-                sys.stderr = error_buffer
+            capture_buffer = _reset_buffer(self._stdout_buf)
+            error_buffer = _reset_buffer(self._stderr_buf)
 
+            with redirect_stdout(capture_buffer), redirect_stderr(error_buffer):
                 # Execute the script in the current Blender context
-                print("[MCP_SCRIPT_EXEC] 开始执行 - 更新前状态")
-                print(f"[MCP_SCENE] 对象数量={len(bpy.context.scene.objects)}")
-                print(
-                    f"[MCP_SCENE] 材质数量={len([m for m in bpy.data.materials if m.users > 0])}",
-                )
-
-                # 强制刷新 Blender 数据
-                bpy.context.view_layer.update()
+                if _DEBUG:
+                    _log.debug("[MCP_SCRIPT_EXEC] 开始执行 - 更新前状态")
+                    _print_scene_stats()
 
                 # 执行脚本
-                exec(script_content, namespace)
+                exec(script_code, namespace)
 
                 # 检查脚本是否定义了main函数并调用它
                 if "main" in namespace and callable(namespace["main"]):
-                    print("[MCP_SCRIPT_EXEC] 检测到main函数，正在调用...")
+                    _log.debug("[MCP_SCRIPT_EXEC] 检测到main函数，正在调用...")
                     namespace["main"]()
-                    print("[MCP_SCRIPT_EXEC] main函数执行完成")
+                    _log.debug("[MCP_SCRIPT_EXEC] main函数执行完成")
                 else:
-                    print("[MCP_SCRIPT_EXEC] 未检测到main函数或已在全局执行")
+                    _log.debug("[MCP_SCRIPT_EXEC] 未检测到main函数或已在全局执行")
 
-                # 简单UI刷新
-                self._simple_ui_refresh()
-
-                print("[MCP_SCRIPT_EXEC] 执行完成 - 更新后状态")
-                print(f"[MCP_SCENE] 对象数量={len(bpy.context.scene.objects)}")
-                print(
-                    f"[MCP_SCENE] 材质数量={len([m for m in bpy.data.materials if m.users > 0])}",
-                )
-
-            finally:
-                # Restore original stdout/stderr
-                sys.stdout = original_stdout
-                sys.stderr = original_stderr
+                if _DEBUG:
+                    _log.debug("[MCP_SCRIPT_EXEC] 执行完成 - 更新后状态")
+                    _print_scene_stats()
 
             captured_output = capture_buffer.getvalue()
             captured_errors = error_buffer.getvalue()
-
-            # Combine output and errors
-            full_output = captured_output
-            if captured_errors:
-                full_output += f"\n--- Errors ---\n{captured_errors}"
+            # Release the buffers' storage now rather than at the next run
+            _reset_buffer(capture_buffer)
+            _reset_buffer(error_buffer)
 
             # 处理字符串中的非ASCII字符，避免JSON编码问题
             def sanitize_string(s):
-                if not isinstance(s, str):
+                if not isinstance(s, str) or s.isascii():
                     return s
-                # 替换可能导致JSON解析问题的字符
-                return s.encode("utf-8", errors="replace").decode("utf-8")
-
-            # 清理输出字符串
-            sanitized_output = sanitize_string(full_output)
-            sanitized_errors = sanitize_string(captured_errors)
+                try:
+                    # Already valid UTF-8 (the common case) - nothing to replace
+                    s.encode("utf-8")
+                    return s
+                except UnicodeEncodeError:
+                    # 替换可能导致JSON解析问题的字符（如孤立代理项）
+                    return s.encode("utf-8", errors="replace").decode("utf-8")
+
+            # 每个缓冲区只清理一次，再拼接已清理的片段（无错误时不拼接）
+            sanitized_errors = sanitize_string(captured_errors) if captured_errors else ""
+            sanitized_output = sanitize_string(captured_output)
+            if sanitized_errors:
+                sanitized_output = "".join(
+                    (sanitized_output, "\n--- Errors ---\n", sanitized_errors),
+                )
 
             result = {
                 "executed": True,
@@ -818,19 +1149,62 @@ class BlenderMCPServer:
                 "script_path": script_path,
                 "parameters": parameters,
                 "result": sanitized_output,
-                "file_size": len(script_content),
+                "file_size": script_size,
                 "errors": sanitized_errors,
                 "success": True,
             }
 
-            print(f"Script execution result: {result}")
+            _log.debug("Script execution result: %r", result)
             return result
 
         except Exception as e:
             error_msg = f"Script execution error: {e!s}"
-            print(error_msg)
-            print(f"Traceback: {traceback.format_exc()}")
-            raise Exception(error_msg)
+            _log.error("%s", error_msg)
+            _log.debug("Script execution traceback", exc_info=True)
+            raise Exception(error_msg) from e
+
+
+def _cmd_get_scene_info(server, params):
+    return {
+        "status": "success",
+        "data": server.get_scene_info(),
+    }
+
+
+def _cmd_execute_code(server, params):
+    return {
+        "status": "success",
+        "data": server.execute_code(params.get("code", "")),
+    }
+
+
+def _cmd_get_server_status(server, params):
+    return {
+        "status": "success",
+        "data": server.get_server_status(),
+    }
+
+
+def _cmd_execute_script_file(server, params):
+    result = server.execute_script_file(
+        params.get("script_name", ""),
+        params.get("scripts_directory", "scripts"),
+        params.get("parameters", {}),
+    )
+    return {
+        "status": "success",
+        "data": result,
+    }
+
+
+# Command type -> handler(server, params). "heartbeat" is not listed: the
+# reactor answers it in _dispatch without touching the main thread.
+BlenderMCPServer._HANDLERS = {
+    "get_scene_info": _cmd_get_scene_info,
+    "execute_code": _cmd_execute_code,
+    "get_server_status": _cmd_get_server_status,
+    "execute_script_file": _cmd_execute_script_file,
+}
 
 
 def start_server_if_needed():
@@ -843,11 +1217,11 @@ def start_server_if_needed():
     if not _server_instance.running:
         success = _server_instance.start()
         if success:
-            print("BlenderMCP server started successfully")
+            _log.info("BlenderMCP server started successfully")
         else:
-            print("Failed to start BlenderMCP server")
+            _log.error("Failed to start BlenderMCP server")
         return success
-    print("BlenderMCP server is already running")
+    _log.info("BlenderMCP server is already running")
     return True
 
 
@@ -857,46 +1231,96 @@ def stop_server():
 
     if _server_instance and _server_instance.running:
         _server_instance.stop()
-        print("BlenderMCP server stopped")
     else:
-        print("BlenderMCP server is not running")
+        _log.info("BlenderMCP server is not running")
+
+
+def _request_restart(reason):
+    """Ask the main thread to restart the server; safe to call from any thread"""
+    _restart_requests.put(reason)
+    if _monitor_timer_running:
+        bpy.app.timers.register(monitor_server, first_interval=0.0)
+
+
+def _drain_restart_requests():
+    """Take all queued restart reasons, oldest first"""
+    reasons = []
+    while True:
+        try:
+            reasons.append(_restart_requests.get_nowait())
+        except queue.Empty:
+            return reasons
 
 
 def monitor_server():
-    """Monitor server health and restart if needed"""
-    global _server_instance, _monitor_timer_running, _last_restart_time, _restart_count
+    """Handle pending restart requests (one-shot timer, no periodic polling)"""
+    global _restart_base, _restart_state, _restart_attempt
 
     if not _monitor_timer_running:
         return None
 
+    reasons = _drain_restart_requests()
+    if not reasons or _restart_state != "idle":
+        # Nothing to do, or a restart is already in flight
+        return None
+
     current_time = time.time()
 
     # Reset restart count every hour
     if current_time - _last_restart_time > 3600:
-        _restart_count = 0
+        _restart_base = _restart_total
 
-    if _server_instance is None:
-        start_server_if_needed()
-    elif _restart_count < _max_restarts_per_hour:
-        # Only check health if server is supposedly running
-        if _server_instance.running and not _server_instance.is_healthy():
-            print("Server unhealthy, attempting restart...")
-            stop_server()
-            time.sleep(2)  # Brief pause before restart
-            if start_server_if_needed():
-                _restart_count += 1
-                _last_restart_time = current_time
-                print(f"Server restarted ({_restart_count}/{_max_restarts_per_hour})")
-        elif not _server_instance.running:
-            # Server stopped unexpectedly, try to restart
-            print("Server stopped unexpectedly, attempting restart...")
-            if start_server_if_needed():
-                _restart_count += 1
-                _last_restart_time = current_time
-                print(f"Server restarted ({_restart_count}/{_max_restarts_per_hour})")
-
-    # Schedule next check - longer interval to reduce system load
-    return 120.0  # Check every 2 minutes
+    if _restart_total - _restart_base >= _max_restarts_per_hour:
+        _log.warning("Server restart limit reached (%d/hour), not restarting", _max_restarts_per_hour)
+        return None
+
+    _log.warning("Server failure (%s), attempting restart...", reasons[-1])
+    _restart_state = "stopping"
+    _restart_attempt = 0
+    stop_server()
+    # Brief pause before restart, without blocking the UI
+    bpy.app.timers.register(_finish_restart, first_interval=2.0)
+    return None
+
+
+def _finish_restart():
+    """Second half of a restart, run 2 seconds after the server was stopped
+
+    Transient bind failures are retried with back-off by returning the next
+    delay, which makes Blender re-run this timer without blocking the UI.
+    After the fast retries it keeps trying every _restart_slow_retry_delay
+    seconds until it succeeds or monitoring is stopped.
+    """
+    global _last_restart_time, _restart_total, _restart_state, _restart_attempt
+    global _restart_failed
+
+    _restart_state = "starting"
+    if start_server_if_needed():
+        _restart_total = next(_restart_counter)
+        _last_restart_time = time.time()
+        _restart_failed = False
+        _log.info(
+            "Server restarted (%d/%d)",
+            _restart_total - _restart_base,
+            _max_restarts_per_hour,
+        )
+    elif _restart_attempt < len(_restart_retry_delays):
+        delay = _restart_retry_delays[_restart_attempt]
+        _restart_attempt += 1
+        _log.warning("Server restart failed, retrying in %.1fs", delay)
+        return delay
+    else:
+        if not _restart_failed:
+            _restart_failed = True
+            _log.error(
+                "Server restart failed after %d retries, retrying every %.0fs",
+                _restart_attempt,
+                _restart_slow_retry_delay,
+            )
+        return _restart_slow_retry_delay
+
+    _restart_state = "idle"
+    return None
 
 
 def start_monitoring():
@@ -905,28 +1329,89 @@ def start_monitoring():
 
     if not _monitor_timer_running:
         _monitor_timer_running = True
-        bpy.app.timers.register(monitor_server, first_interval=5.0)
-        print("Server monitoring started")
+        # Handle any failure reported while monitoring was off
+        if not _restart_requests.empty():
+            bpy.app.timers.register(monitor_server, first_interval=0.0)
+        _log.info("Server monitoring started")
 
 
 def stop_monitoring():
-    """Stop server monitoring"""
-    global _monitor_timer_running
+    """Stop server monitoring and cancel any queued or scheduled restart"""
+    global _monitor_timer_running, _restart_state, _restart_failed
 
+    # Otherwise a later start_monitoring() would act on a stale failure
+    _drain_restart_requests()
     if _monitor_timer_running:
         _monitor_timer_running = False
-        if bpy.app.timers.is_registered(monitor_server):
-            bpy.app.timers.unregister(monitor_server)
-        print("Server monitoring stopped")
+        # One-shot timers are usually gone already; unregister raises ValueError then
+        for timer in (monitor_server, _finish_restart):
+            try:
+                bpy.app.timers.unregister(timer)
+            except ValueError:
+                pass
+        _restart_state = "idle"
+        _restart_failed = False
+        _log.info("Server monitoring stopped")
+
+
+# (upper bound in seconds, divisor, format) - the last entry has no bound
+_UPTIME_FORMATS = (
+    (60, 1, "{:.0f}s"),
+    (3600, 60, "{:.0f}m"),
+    (None, 3600, "{:.1f}h"),
+)
+
+
+# Last (whole seconds, text) returned; the panel redraws far more often than 1 Hz
+_uptime_cache = (-1, "")
 
 
 def format_uptime(seconds):
     """Format uptime in human readable format"""
-    if seconds < 60:
-        return f"{seconds:.0f}s"
-    if seconds < 3600:
-        return f"{seconds / 60:.0f}m"
-    return f"{seconds / 3600:.1f}h"
+    global _uptime_cache
+
+    whole = int(seconds)
+    if whole == _uptime_cache[0]:
+        return _uptime_cache[1]
+
+    for limit, divisor, fmt in _UPTIME_FORMATS:
+        if limit is None or whole < limit:
+            text = fmt.format(whole / divisor)
+            break
+    _uptime_cache = (whole, text)
+    return text
+
+
+# Script counts keyed by (scripts_root, directory mtime)
+_script_count_cache = {}
+
+
+def _count_scripts(scripts_root):
+    """Count runnable Python scripts, skipping listdir while the directory is unchanged"""
+    key = (scripts_root, os.path.getmtime(scripts_root))
+    count = _script_count_cache.get(key)
+    if count is None:
+        # DirEntry.is_file() uses the type cached by the directory scan
+        with os.scandir(scripts_root) as entries:
+            count = sum(
+                1
+                for entry in entries
+                if entry.name.endswith(".py")
+                and not entry.name.startswith("_")
+                and entry.is_file()
+            )
+        _script_count_cache.clear()
+        _script_count_cache[key] = count
+    return count
+
+
+# Constant panel labels
+_LABEL_RUNNING = "● 服务器运行中"
+_LABEL_UNHEALTHY = "● 服务器异常"
+_LABEL_STOPPED = "● 服务器已停止"
+_LABEL_MONITOR_ON = "自动监控: 已启用"
+_LABEL_MONITOR_OFF = "自动监控: 已禁用"
+_LABEL_RESTART_FAILED = f"自动重启失败，每 {_restart_slow_retry_delay:.0f} 秒重试"
 
 
 class BLENDERMCP_PT_Panel(bpy.types.Panel):
@@ -942,40 +1427,47 @@ class BLENDERMCP_PT_Panel(bpy.types.Panel):
         
         # 简化UI - 不再使用复杂的属性组
 
+        server = _server_instance if _server_instance and _server_instance.running else None
+        show_advanced = context.window_manager.blendermcp_show_advanced
+
         # 服务器状态 - 简洁的状态指示
         status_box = layout.box()
         
-        if _server_instance and _server_instance.running:
-            status = _server_instance.get_server_status()
-            server_info = status["server"]
-            
+        if server:
             # 主状态行
             row = status_box.row()
             row.scale_y = 1.5
-            if server_info["healthy"]:
-                row.label(text="● 服务器运行中", icon="CHECKMARK")
+            if server.is_healthy():
+                row.label(text=_LABEL_RUNNING, icon="CHECKMARK")
             else:
                 row.alert = True
-                row.label(text="● 服务器异常", icon="ERROR")
+                row.label(text=_LABEL_UNHEALTHY, icon="ERROR")
             
             # 快速信息
             col = status_box.column()
-            col.label(text=f"端口: {server_info['port']}")
+            col.label(text=f"端口: {server.port}")
             
             # 如果有错误显示错误信息
-            if server_info.get("last_error"):
+            if server.last_error_short:
                 col.alert = True
-                col.label(text=f"错误: {server_info['last_error'][:50]}...", icon="ERROR")
+                col.label(text=f"错误: {server.last_error_short}", icon="ERROR")
         else:
             row = status_box.row()
             row.scale_y = 1.5
             row.alert = True
-            row.label(text="● 服务器已停止", icon="CANCEL")
+            row.label(text=_LABEL_STOPPED, icon="CANCEL")
+
+            if _restart_failed:
+                col = status_box.column()
+                col.alert = True
+                col.label(text=_LABEL_RESTART_FAILED, icon="ERROR")
+                if _server_instance and _server_instance.last_error_short:
+                    col.label(text=f"错误: {_server_instance.last_error_short}")
 
         # 控制按钮 - 更突出
         row = layout.row(align=True)
         row.scale_y = 1.3
-        if _server_instance and _server_instance.running:
+        if server:
             row.operator("blendermcp.restart_server", text="重启服务器", icon="FILE_REFRESH")
             row.operator("blendermcp.emergency_stop", text="停止", icon="CANCEL")
         else:
@@ -1001,22 +1493,31 @@ class BLENDERMCP_PT_Panel(bpy.types.Panel):
         col.operator("blendermcp.clear_scene", text="清空场景", icon="TRASH")
         col.operator("blendermcp.test_connection", text="测试连接", icon="LINKED")
         
-        # 高级选项（固定显示）
+        # 高级选项（可折叠，折叠时不获取服务器状态）
         advanced_box = layout.box()
-        advanced_box.label(text="高级选项", icon="TOOL_SETTINGS")
-        
-        if _server_instance and _server_instance.running:
-            status = _server_instance.get_server_status()
-            advanced_box.label(text=f"运行时间: {format_uptime(status['server']['uptime'])}")
-            advanced_box.label(text=f"处理命令: {status['commands']['total_processed']}")
-            advanced_box.label(text=f"总连接数: {status['connections']['total']}")
+        advanced_box.prop(
+            context.window_manager,
+            "blendermcp_show_advanced",
+            text="高级选项",
+            icon="TRIA_DOWN" if show_advanced else "TRIA_RIGHT",
+            emboss=False,
+        )
+        if not show_advanced:
+            return
+
+        if server:
+            # 直接读取计数器，不为三个标签构建完整的状态字典
+            uptime = time.time() - server.start_time if server.start_time else 0
+            advanced_box.label(text=f"运行时间: {format_uptime(uptime)}")
+            advanced_box.label(text=f"处理命令: {server.total_commands_processed}")
+            advanced_box.label(text=f"总连接数: {server.total_client_connections}")
         
         # 监控状态
         row = advanced_box.row()
-        if _monitor_timer_running:
-            row.label(text="自动监控: 已启用", icon="TIME")
-        else:
-            row.label(text="自动监控: 已禁用", icon="TIME")
+        row.label(
+            text=_LABEL_MONITOR_ON if _monitor_timer_running else _LABEL_MONITOR_OFF,
+            icon="TIME",
+        )
 
 
 class BLENDERMCP_OT_RestartServer(bpy.types.Operator):
@@ -1063,18 +1564,10 @@ class BLENDERMCP_OT_TestScriptsPath(bpy.types.Operator):
             except (AttributeError, RuntimeError):
                 scripts_root = DEFAULT_SCRIPTS_ROOT
 
-        import os
-
         if os.path.exists(scripts_root) and os.path.isdir(scripts_root):
-            # Count Python files
-            py_files = [
-                f
-                for f in os.listdir(scripts_root)
-                if f.endswith(".py") and not f.startswith("_")
-            ]
             self.report(
                 {"INFO"},
-                f"路径有效！找到 {len(py_files)} 个 Python 脚本",
+                f"路径有效！找到 {_count_scripts(scripts_root)} 个 Python 脚本",
             )
         else:
             self.report(
@@ -1085,6 +1578,20 @@ class BLENDERMCP_OT_TestScriptsPath(bpy.types.Operator):
         return {"FINISHED"}
 
 
+def _resolve_folder_opener():
+    """Pick the platform's file manager opener once; the OS never changes at runtime"""
+    system = platform.system()
+    if system == "Windows":
+        return os.startfile
+    # Popen: the file manager keeps running, there is nothing to wait for
+    if system == "Darwin":  # macOS
+        return lambda path: subprocess.Popen(["open", path])
+    return lambda path: subprocess.Popen(["xdg-open", path])  # Linux
+
+
+_OPEN_FOLDER = _resolve_folder_opener()
+
+
 class BLENDERMCP_OT_OpenScriptsFolder(bpy.types.Operator):
     bl_idname = "blendermcp.open_scripts_folder"
     bl_label = "Open Scripts Folder"
@@ -1101,17 +1608,8 @@ class BLENDERMCP_OT_OpenScriptsFolder(bpy.types.Operator):
             except (AttributeError, RuntimeError):
                 scripts_root = DEFAULT_SCRIPTS_ROOT
 
-        import os
-        import platform
-        import subprocess
-
-        if os.path.exists(scripts_root):
-            if platform.system() == "Windows":
-                os.startfile(scripts_root)
-            elif platform.system() == "Darwin":  # macOS
-                subprocess.run(["open", scripts_root])
-            else:  # Linux
-                subprocess.run(["xdg-open", scripts_root])
+        if os.path.isdir(scripts_root):
+            _OPEN_FOLDER(scripts_root)
             self.report({"INFO"}, f"打开目录: {scripts_root}")
         else:
             self.report({"ERROR"}, f"目录不存在: {scripts_root}")
@@ -1125,18 +1623,15 @@ class BLENDERMCP_OT_ClearScene(bpy.types.Operator):
     bl_description = "清除场景中的所有对象"
 
     def execute(self, context):
-        # 删除所有对象
-        bpy.ops.object.select_all(action='SELECT')
-        bpy.ops.object.delete(use_global=False)
-        
-        # 删除所有网格数据
-        for mesh in bpy.data.meshes:
-            bpy.data.meshes.remove(mesh)
-        
-        # 删除所有材质
-        for material in bpy.data.materials:
-            bpy.data.materials.remove(material)
-            
+        # 删除所有对象（直接操作数据，绕过操作符系统）
+        bpy.data.batch_remove(ids=tuple(context.scene.objects))
+
+        # 回收删除对象后变为孤立的数据块
+        bpy.data.orphans_purge(do_local_ids=True, do_recursive=True)
+
+        # 批量删除剩余的网格和材质数据
+        bpy.data.batch_remove(ids=(*bpy.data.meshes, *bpy.data.materials))
+
         self.report({"INFO"}, "场景已清空")
         return {"FINISHED"}
 
@@ -1162,50 +1657,65 @@ class BLENDERMCP_OT_TestConnection(bpy.types.Operator):
         return {"FINISHED"}
 
 
+_classes = (
+    BLENDERMCP_PT_Panel,
+    BLENDERMCP_OT_RestartServer,
+    BLENDERMCP_OT_EmergencyStop,
+    BLENDERMCP_OT_TestScriptsPath,
+    BLENDERMCP_OT_OpenScriptsFolder,
+    BLENDERMCP_OT_ClearScene,
+    BLENDERMCP_OT_TestConnection,
+)
+
+_register_classes, _unregister_classes = bpy.utils.register_classes_factory(_classes)
+
+
+def _post_register():
+    """Auto-start server and monitoring on the first idle tick (one-shot timer)"""
+    if not start_server_if_needed():
+        # Picked up by start_monitoring, which retries with back-off
+        _request_restart("Initial server start failed")
+    start_monitoring()
+    return None
+
+
 def register():
     try:
         # 简化注册过程 - 只注册UI类，不再使用复杂的属性组
-        bpy.utils.register_class(BLENDERMCP_PT_Panel)
-        bpy.utils.register_class(BLENDERMCP_OT_RestartServer)
-        bpy.utils.register_class(BLENDERMCP_OT_EmergencyStop)
-        bpy.utils.register_class(BLENDERMCP_OT_TestScriptsPath)
-        bpy.utils.register_class(BLENDERMCP_OT_OpenScriptsFolder)
-        bpy.utils.register_class(BLENDERMCP_OT_ClearScene)
-        bpy.utils.register_class(BLENDERMCP_OT_TestConnection)
+        _register_classes()
 
-        # Auto-start server and monitoring
-        start_server_if_needed()
-        start_monitoring()
+        # 高级选项折叠状态（仅UI状态，不保存到文件）
+        bpy.types.WindowManager.blendermcp_show_advanced = bpy.props.BoolProperty(
+            name="显示高级选项",
+            default=False,
+        )
 
-        print("BlenderMCP addon registered and started")
-    except Exception as e:
-        print(f"Error registering BlenderMCP addon: {e}")
-        import traceback
+        # 延迟启动服务器，避免在插件加载时同步绑定端口
+        bpy.app.timers.register(_post_register, first_interval=0.1)
 
-        traceback.print_exc()
+        _log.info("BlenderMCP addon registered")
+    except Exception:
+        _log.exception("Error registering BlenderMCP addon")
 
 
 def unregister():
     try:
+        # Cancel a deferred start that has not run yet
+        if bpy.app.timers.is_registered(_post_register):
+            bpy.app.timers.unregister(_post_register)
+
         # Stop monitoring and server first
         stop_monitoring()
         stop_server()
 
-        # Unregister UI classes
-        bpy.utils.unregister_class(BLENDERMCP_OT_TestConnection)
-        bpy.utils.unregister_class(BLENDERMCP_OT_ClearScene)
-        bpy.utils.unregister_class(BLENDERMCP_OT_OpenScriptsFolder)
-        bpy.utils.unregister_class(BLENDERMCP_OT_EmergencyStop)
-        bpy.utils.unregister_class(BLENDERMCP_OT_RestartServer)
-        bpy.utils.unregister_class(BLENDERMCP_OT_TestScriptsPath)
-        bpy.utils.unregister_class(BLENDERMCP_PT_Panel)
-
-        print("BlenderMCP addon unregistered")
-    except Exception as e:
-        print(f"Error unregistering BlenderMCP addon: {e}")
-        import traceback
-
-        traceback.print_exc()
+        del bpy.types.WindowManager.blendermcp_show_advanced
+
+        # Unregister UI classes (reverse order)
+        _unregister_classes()
+
+        _log.info("BlenderMCP addon unregistered")
+    except Exception:
+        _log.exception("Error unregistering BlenderMCP addon")
 
 
 if __name__ == "__main__":
@@ -123,6 +123,30 @@ def get_windows_host_ip() -> str:
     return '127.0.0.1'
 
 
+# 消息帧头：4字节大端长度前缀，与 Blender 插件端保持一致
+FRAME_HEADER_SIZE = 4
+# 帧头首字节恒为 0，消息体上限与插件端 _MAX_FRAME_SIZE 相同
+MAX_FRAME_SIZE = (1 << 24) - 1
+
+
+def _recv_exactly(sock: socket.socket, n: int) -> bytes:
+    """从 socket 读取恰好 n 个字节，连接提前关闭时抛出 ConnectionError。
+
+    数据直接写入预分配的缓冲区，避免逐块拼接带来的重复分配。
+    """
+    buf = bytearray(n)
+    view = memoryview(buf)
+    received = 0
+    while received < n:
+        count = sock.recv_into(view[received:])
+        if not count:
+            raise ConnectionError(
+                f"Connection closed after {received} of {n} bytes",
+            )
+        received += count
+    return bytes(buf)
+
+
 def send_command(
     command: dict[str, Any],
     connection: BlenderConnection,
@@ -173,91 +197,56 @@ def send_command(
                     logger.error(f"JSON serialization failed: {e}")
                     return {"success": False, "error": f"JSON serialization failed: {e}"}
 
-                # 发送命令
-                sock.sendall(command_json.encode("utf-8"))
+                # 发送命令（4字节大端长度前缀 + JSON）
+                payload = command_json.encode("utf-8")
+                sock.sendall(len(payload).to_bytes(FRAME_HEADER_SIZE, "big") + payload)
                 logger.debug(f"Sent command: {command.get('command', 'unknown')}")
 
-                # 接收响应 - 改进的响应处理逻辑
-                response_data = b""
-                start_time = time.time()
-                
-                # 等待初始响应
-                sock.settimeout(2.0)  # 短超时等待响应开始
-                
+                # 接收响应 - 先读长度前缀，再读完整消息体
                 try:
-                    # 首先等待一些数据到达
-                    initial_chunk = sock.recv(1024)
-                    if initial_chunk:
-                        response_data += initial_chunk
-                        
-                        # 如果看起来是完整的JSON，尝试解析
-                        try:
-                            response_str = response_data.decode("utf-8")
-                            if response_str.strip():
-                                result = json.loads(response_str)
-                                logger.debug(f"Received complete response: {len(response_str)} chars")
-                                return result
-                        except (json.JSONDecodeError, UnicodeDecodeError):
-                            # 不是完整的JSON，继续接收
-                            pass
-                        
-                        # 继续接收剩余数据
-                        sock.settimeout(connection.timeout)
-                        while True:
-                            try:
-                                chunk = sock.recv(8192)
-                                if not chunk:
-                                    break
-                                response_data += chunk
-                                
-                                # 检查是否接收到完整的JSON
-                                try:
-                                    response_str = response_data.decode("utf-8")
-                                    result = json.loads(response_str)
-                                    logger.debug(f"Received complete response: {len(response_str)} chars")
-                                    return result
-                                except (json.JSONDecodeError, UnicodeDecodeError):
-                                    # 还没有接收到完整的数据，继续接收
-                                    continue
-                                    
-                            except socket.timeout:
-                                # 超时，检查是否有可用数据
-                                if time.time() - start_time > connection.timeout:
-                                    break
-                                continue
-                            except socket.error:
-                                break
-                    else:
-                        # 没有接收到初始数据
-                        logger.warning("No initial response received")
-                        
-                except socket.timeout:
-                    logger.warning("Timeout waiting for initial response")
-                except socket.error as e:
-                    logger.error(f"Socket error during response: {e}")
-
-                # 最后尝试解析接收到的数据
-                if response_data:
-                    try:
-                        response_str = response_data.decode("utf-8")
-                        if response_str.strip():
-                            result = json.loads(response_str)
-                            logger.debug(f"Parsed final response: {len(response_str)} chars")
-                            return result
-                        else:
-                            logger.warning("Received empty response")
-                            return {"success": False, "error": "Empty response received from server"}
-                    except (json.JSONDecodeError, UnicodeDecodeError) as e:
-                        logger.error(f"Failed to parse response: {e}")
-                        logger.error(f"Response data: {response_data[:500]}...")
+                    header = _recv_exactly(sock, FRAME_HEADER_SIZE)
+                    size = int.from_bytes(header, "big")
+                    if header.startswith(b"{"):
+                        # 旧版插件直接返回 JSON，且无法解析带帧头的请求
+                        logger.error("Blender addon replied without framing")
+                        return {
+                            "success": False,
+                            "error": (
+                                "Protocol mismatch: server is not speaking framed "
+                                "responses; please upgrade the Blender addon"
+                            ),
+                        }
+                    if size > MAX_FRAME_SIZE:
+                        # 不是合法帧头，不能按它分配缓冲区
+                        logger.error(f"Invalid frame header: {header!r}")
                         return {
                             "success": False,
-                            "error": f"Invalid response format: {e}",
-                            "raw_response": response_data.decode("utf-8", errors="replace")[:500],
+                            "error": "Protocol mismatch: server is not speaking framed responses",
                         }
-                else:
-                    logger.warning("No response received from server")
-                    return {"success": False, "error": "No response received from server"}
+                    response_data = _recv_exactly(sock, size)
+                except socket.timeout:
+                    logger.warning("Timeout waiting for response")
+                    return {"success": False, "error": "Timeout waiting for response from server"}
+                except ConnectionError as e:
+                    logger.error(f"Socket error during response: {e}")
+                    return {"success": False, "error": f"Incomplete response: {e}"}
+
+                if not response_data.strip():
+                    logger.warning("Received empty response")
+                    return {"success": False, "error": "Empty response received from server"}
+
+                try:
+                    result = json.loads(response_data)
+                    logger.debug(f"Received complete response: {len(response_data)} bytes")
+                    return result
+                except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                    logger.error(f"Failed to parse response: {e}")
+                    logger.error(f"Response data: {response_data[:500]}...")
+                    return {
+                        "success": False,
+                        "error": f"Invalid response format: {e}",
+                        "raw_response": response_data.decode("utf-8", errors="replace")[:500],
+                    }
 
         except Exception as e:
             if attempt < max_retries - 1:
@@ -0,0 +1,60 @@
+"""send_command 帧协议测试：使用本地假服务器，不需要 Blender"""
+
+import contextlib
+import socket
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from tools import utils
+
+
+@pytest.fixture
+def fake_server(monkeypatch):
+    """启动只应答一次的本地服务器；调用 respond(data) 设定应答并得到连接配置"""
+    monkeypatch.setattr(utils, "get_windows_host_ip", lambda: "127.0.0.1")
+    listener = socket.create_server(("127.0.0.1", 0))
+    reply = {}
+
+    def serve():
+        client, _ = listener.accept()
+        with client:
+            client.recv(65536)
+            client.sendall(reply["data"])
+            # 保持连接打开，客户端必须自己判断协议不匹配
+            with contextlib.suppress(ConnectionError):
+                client.recv(1)
+
+    thread = threading.Thread(target=serve, daemon=True)
+    connection = utils.BlenderConnection("127.0.0.1", listener.getsockname()[1], 5.0)
+
+    def respond(data):
+        reply["data"] = data
+        thread.start()
+        return connection
+
+    yield respond
+    thread.join(5.0)
+    listener.close()
+
+
+def test_send_command_framed_response(fake_server):
+    body = b'{"status":"success","result":{"ok":true}}'
+    connection = fake_server(len(body).to_bytes(4, "big") + body)
+
+    result = utils.send_command({"type": "get_scene_info", "params": {}}, connection)
+
+    assert result == {"status": "success", "result": {"ok": True}}
+
+
+def test_send_command_unframed_server_fails_fast(fake_server):
+    connection = fake_server(b'{"status": "error", "message": "Invalid JSON"}')
+
+    result = utils.send_command({"type": "get_scene_info", "params": {}}, connection)
+
+    assert result["success"] is False
+    assert "upgrade the Blender addon" in result["error"]